@@ -1,17 +1,33 @@
 """PyQt6 front-end for the MangaPark downloader."""
 from __future__ import annotations
 
+import asyncio
+import collections
+import concurrent.futures
 import contextlib
+import logging
+import multiprocessing
 import os
-import shutil
 import subprocess
 import sys
+import threading
 from pathlib import Path
 import traceback
-from typing import Callable, Dict, List, Tuple
-
-from PyQt6.QtCore import QEasingCurve, QPropertyAnimation, QRunnable, Qt, QThreadPool, pyqtSignal, QObject
+from typing import Awaitable, Callable, Dict, List
+
+from PyQt6.QtCore import (
+    QAbstractListModel,
+    QEasingCurve,
+    QModelIndex,
+    QObject,
+    QPropertyAnimation,
+    Qt,
+    QTimer,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QGuiApplication, QTextCursor
 from PyQt6.QtWidgets import (
+    QAbstractItemView,
     QApplication,
     QCheckBox,
     QComboBox,
@@ -20,8 +36,7 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QMainWindow,
     QMessageBox,
     QPushButton,
@@ -37,48 +52,40 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from mangapark import (
-    create_cbz,
-    create_pdf,
-    download_chapter_with_selenium,
-    download_chapters_threaded,
-    get_chapter_info,
-)
 from gui.style import APP_STYLE, apply_palette
 
 
-class _StreamRedirect:
-    def __init__(self, emit: Callable[[str], None]):
-        self.emit = emit
-        self.buffer = ""
+def _mangapark():
+    # Deferred so Selenium, PIL, aiohttp and friends load on first use rather than before the window appears
+    import mangapark  # pylint: disable=import-outside-toplevel
 
-    def _push(self, chunk: str) -> None:
-        chunk = chunk.strip()
-        if chunk:
-            self.emit(chunk)
+    return mangapark
 
-    def write(self, text: str) -> None:
-        self.buffer += text
-        while "\n" in self.buffer:
-            line, self.buffer = self.buffer.split("\n", 1)
-            self._push(line)
 
-    def flush(self) -> None:
-        if self.buffer:
-            self._push(self.buffer)
-            self.buffer = ""
+class _SignalLogHandler(logging.Handler):
+    def __init__(self, emit: Callable[[str], None]):
+        super().__init__(logging.INFO)
+        self._emit_line = emit
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._emit_line(self.format(record))
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
 
 
 @contextlib.contextmanager
-def redirect_streams(emit: Callable[[str], None]):
-    redirector = _StreamRedirect(emit)
-    stdout, stderr = sys.stdout, sys.stderr
-    sys.stdout = sys.stderr = redirector  # type: ignore
+def forward_logs(emit: Callable[[str], None]):
+    # Signal emission is thread-safe, so records from any backend thread can be forwarded
+    logger = logging.getLogger("mangapark")
+    handler = _SignalLogHandler(emit)
+    logger.addHandler(handler)
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
     try:
         yield
     finally:
-        redirector.flush()
-        sys.stdout, sys.stderr = stdout, stderr
+        logger.removeHandler(handler)
 
 
 class WorkerSignals(QObject):
@@ -89,34 +96,41 @@ class WorkerSignals(QObject):
     progress = pyqtSignal(int)
 
 
-class TaskRunnable(QRunnable):
-    def __init__(self, fn: Callable, *args, **kwargs):
-        super().__init__()
+class AsyncTask:
+    def __init__(self, fn: Callable[..., Awaitable], *args, capture_logs: bool = False, **kwargs):
         self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.capture_logs = capture_logs
         self.signals = WorkerSignals()
 
-    def run(self) -> None:  # pragma: no cover
+    async def run(self) -> None:  # pragma: no cover
         try:
-            with redirect_streams(self.signals.log.emit):
-                result = self.fn(self.signals, *self.args, **self.kwargs)
+            # Backend log records are shown in the activity log while the job runs
+            logs = forward_logs(self.signals.log.emit) if self.capture_logs else contextlib.nullcontext()
+            with logs:
+                result = await self.fn(self.signals, *self.args, **self.kwargs)
             self.signals.result.emit(result)
-        except Exception:  # pylint: disable=broad-except
-            self.signals.error.emit(traceback.format_exc())
+        except Exception as exc:  # pylint: disable=broad-except
+            # Full tracebacks are only formatted when debug logging asks for them
+            if logging.getLogger("mangapark").isEnabledFor(logging.DEBUG):
+                self.signals.error.emit(traceback.format_exc())
+            else:
+                self.signals.error.emit(f"{type(exc).__name__}: {exc}")
         finally:
             self.signals.finished.emit()
 
 
-def fetch_chapter_metadata(signals: WorkerSignals, manga_url: str, use_nsfw_mode: bool = False):
+async def fetch_chapter_metadata(signals: WorkerSignals, manga_url: str, use_nsfw_mode: bool = False):
     mode = "NSFW" if use_nsfw_mode else "SFW"
     signals.log.emit(f"Fetching chapter information from {manga_url} using {mode} mode...")
-    chapters = get_chapter_info(manga_url, use_nsfw_mode)
+    # The first import of mangapark is slow, so it happens in the worker thread too
+    chapters = await asyncio.to_thread(lambda: _mangapark().get_chapter_info(manga_url, use_nsfw_mode))
     if not chapters:
         raise ValueError("No chapters found. Verify the URL or try again later.")
     signals.log.emit(f"Found {len(chapters)} chapter(s).")
     return chapters
 
 
-def run_download_job(
+async def run_download_job(
     signals: WorkerSignals,
     chapters: List[Dict[str, str]],
     threaded: bool,
@@ -127,67 +141,124 @@ def run_download_job(
     if not chapters:
         raise ValueError("Select at least one chapter before downloading.")
 
-    os.makedirs("downloads", exist_ok=True)
-    mode = f"{concurrency} threads" if threaded else "sequential mode"
+    mangapark = await asyncio.to_thread(_mangapark)
+
+    # Each chapter is converted as soon as it finishes downloading
+    convert = convert_mode in {"cbz", "pdf", "both"}
+
+    mangapark.ensure_downloads_dir()
+    mode = f"{concurrency} concurrent downloads" if threaded else "sequential mode"
     signals.log.emit(f"Downloading {len(chapters)} chapter(s) in {mode}.")
 
-    if threaded:
-        successful = download_chapters_threaded(chapters, max(1, concurrency))
-    else:
-        successful = []
-        total = len(chapters)
-        for idx, chapter in enumerate(chapters, 1):
-            signals.log.emit(f"[{idx}/{total}] {chapter['title']}")
-            chapter_dir, ok = download_chapter_with_selenium(chapter['url'], chapter['title'], 1)
-            if ok:
-                successful.append((chapter_dir, chapter['title']))
-            signals.progress.emit(int(idx / total * 60))
-
-    if not successful:
-        signals.log.emit("No chapters finished successfully.")
-        signals.progress.emit(100)
-        return []
-
-    conversions: List[Tuple[str, Callable[[str, str], str | None]]] = []
-    if convert_mode in {"cbz", "both"}:
-        conversions.append(("CBZ", create_cbz))
-    if convert_mode in {"pdf", "both"}:
-        conversions.append(("PDF", create_pdf))
-
-    for phase, (label, converter) in enumerate(conversions, 1):
-        signals.log.emit(f"{label} conversion running...")
-        total = len(successful)
-        for idx, (chapter_dir, chapter_title) in enumerate(successful, 1):
-            if label == "PDF" and not os.path.exists(chapter_dir):
-                signals.log.emit(f"Sources missing for {chapter_title}, skipping PDF.")
-                continue
-            output = converter(chapter_dir, chapter_title)
+    total = len(chapters)
+    downloads_done = conversions_done = 0
+    last_progress = -1
+
+    def report_progress(value: int) -> None:
+        # Each emit is a queued call into the GUI thread, so skip values the bar already shows
+        nonlocal last_progress
+        if value != last_progress:
+            last_progress = value
+            signals.progress.emit(value)
+
+    def update_progress() -> None:
+        if not convert:
+            # Downloads are the whole job, so they get the whole bar
+            report_progress(min(95, int(downloads_done / total * 95)))
+            return
+        report_progress(min(95, int(downloads_done / total * 60) + int(conversions_done / total * 35)))
+
+    loop = asyncio.get_running_loop()
+    conversion_tasks: List[asyncio.Future] = []
+
+    async def convert_chapter(pool, chapter_dir: str, chapter_title: str) -> None:
+        nonlocal conversions_done
+        # The backend helper writes every format and, only if all of them succeeded, deletes the images
+        results = await loop.run_in_executor(
+            pool, mangapark.convert_chapter, chapter_dir, chapter_title, convert_mode, delete_sources
+        )
+        conversions_done += 1
+        for label, output in results:
             if output:
                 signals.log.emit(f"✔ {label} ready: {output}")
-                if delete_sources and os.path.isdir(chapter_dir):
-                    try:
-                        shutil.rmtree(chapter_dir)
-                        signals.log.emit(f"Removed source images for {chapter_title}.")
-                    except Exception as exc:  # pylint: disable=broad-except
-                        signals.log.emit(f"Cleanup failed for {chapter_title}: {exc}")
             else:
                 signals.log.emit(f"✖ {label} failed for {chapter_title}")
-            span = 35 // max(1, len(conversions))
-            progress = 60 + (phase - 1) * span + int(idx / max(1, total) * span)
-            signals.progress.emit(min(95, progress))
+        if delete_sources and results and all(output for _, output in results):
+            signals.log.emit(f"Removed source images for {chapter_title}.")
+        update_progress()
+
+    def on_chapter_done(chapter: Dict[str, str], chapter_dir: str, ok: bool) -> None:
+        nonlocal downloads_done
+        downloads_done += 1
+        signals.log.emit(f"[{downloads_done}/{total}] {chapter['title']}")
+        if ok and convert:
+            conversion_tasks.append(asyncio.ensure_future(convert_chapter(pool, chapter_dir, chapter["title"])))
+        update_progress()
+
+    # zip/PDF encoding is CPU-bound, so chapters are converted in parallel worker processes.
+    # Workers are spawned rather than forked: forking copies a process running Qt plus the
+    # event loop and executor threads, along with the log handler that emits Qt signals
+    spawn = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(mp_context=spawn) as pool:
+        # Sequential mode is the same downloader limited to one chapter and one connection at a time
+        successful = await mangapark.download_chapters_async(
+            chapters, max(1, concurrency) if threaded else 1, on_chapter_done
+        )
+
+        if not successful:
+            signals.log.emit("No chapters finished successfully.")
+            report_progress(100)
+            return []
+
+        if conversion_tasks:
+            signals.log.emit("Waiting for remaining conversions...")
+            await asyncio.gather(*conversion_tasks)
 
-    signals.progress.emit(100)
+    report_progress(100)
     return successful
 
 
+class ChapterListModel(QAbstractListModel):
+    """Read-only list model exposing chapter titles straight from the fetched chapter dicts."""
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._chapters: List[Dict[str, str]] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # pylint: disable=invalid-name
+        return 0 if parent.isValid() else len(self._chapters)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
+            return self._chapters[index.row()]["title"]
+        return None
+
+    def chapter(self, row: int) -> Dict[str, str]:
+        return self._chapters[row]
+
+    def set_chapters(self, chapters: List[Dict[str, str]]) -> None:
+        # One model reset instead of a row insert per chapter
+        self.beginResetModel()
+        self._chapters = list(chapters)
+        self.endResetModel()
+
+
 class MangaParkWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("MangaPark Downloader")
         self.setMinimumSize(900, 600)
-        self.thread_pool = QThreadPool()
+        # Worker jobs are coroutines scheduled on one long-lived event loop thread
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
         self._build_ui()
         self._animate_banner()
+        # Log lines are buffered and flushed in one document edit per tick
+        self._log_buffer: collections.deque[str] = collections.deque()
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_logs)
+        self._log_timer.start()
 
     def _build_ui(self) -> None:
         container = QWidget()
@@ -221,8 +292,11 @@ class MangaParkWindow(QMainWindow):
         available_chapters_label = QLabel("Available Chapters")
         available_chapters_label.setObjectName("SectionLabel")
         grid.addWidget(available_chapters_label, 1, 0)
-        self.chapter_list = QListWidget()
-        self.chapter_list.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
+        self.chapter_model = ChapterListModel(self)
+        self.chapter_list = QListView()
+        self.chapter_list.setObjectName("ChapterList")
+        self.chapter_list.setModel(self.chapter_model)
+        self.chapter_list.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
         grid.addWidget(self.chapter_list, 1, 1)
 
         options = QHBoxLayout()
@@ -268,6 +342,10 @@ class MangaParkWindow(QMainWindow):
         self.log_area = QTextEdit()
         self.log_area.setReadOnly(True)
         self.log_area.setMinimumHeight(160)
+        # Read-only log: no undo history, and only the most recent lines are kept
+        self.log_area.document().setUndoRedoEnabled(False)
+        self.log_area.document().setMaximumBlockCount(5000)
+        self._log_cursor = QTextCursor(self.log_area.document())
         grid.addWidget(self.log_area, 5, 1)
 
         root.addWidget(card)
@@ -283,14 +361,33 @@ class MangaParkWindow(QMainWindow):
         self.anim.setEasingCurve(QEasingCurve.Type.InOutQuad)
         self.anim.setLoopCount(-1)
         self.anim.start()
+        QGuiApplication.instance().applicationStateChanged.connect(self._on_app_state_changed)
+
+    def _set_banner_running(self, running: bool) -> None:
+        # The looped animation repaints every frame, so it only runs while someone can see it
+        if running and self.anim.state() == QPropertyAnimation.State.Paused:
+            self.anim.resume()
+        elif not running and self.anim.state() == QPropertyAnimation.State.Running:
+            self.anim.pause()
+
+    def _on_app_state_changed(self, state: Qt.ApplicationState) -> None:
+        self._set_banner_running(state == Qt.ApplicationState.ApplicationActive and self.isVisible())
+
+    def showEvent(self, event) -> None:  # pylint: disable=invalid-name
+        super().showEvent(event)
+        self._set_banner_running(True)
 
-    def _bind_worker(self, worker: TaskRunnable, on_result: Callable):
+    def hideEvent(self, event) -> None:  # pylint: disable=invalid-name
+        self._set_banner_running(False)
+        super().hideEvent(event)
+
+    def _bind_worker(self, worker: AsyncTask, on_result: Callable):
         worker.signals.result.connect(on_result)
         worker.signals.log.connect(self._append_log)
         worker.signals.error.connect(self._show_error)
         worker.signals.finished.connect(lambda: self._set_busy(False))
         worker.signals.progress.connect(self.progress.setValue)
-        self.thread_pool.start(worker)
+        asyncio.run_coroutine_threadsafe(worker.run(), self.loop)
 
     def _on_fetch_clicked(self) -> None:
         url = self.url_input.text().strip()
@@ -298,22 +395,21 @@ class MangaParkWindow(QMainWindow):
             self._show_error("Please enter a MangaPark URL.")
             return
         use_nsfw = self.nsfw_box.isChecked()
-        worker = TaskRunnable(fetch_chapter_metadata, url, use_nsfw)
+        worker = AsyncTask(fetch_chapter_metadata, url, use_nsfw, capture_logs=True)
         self._append_log("Retrieving chapters...")
         self._set_busy(True)
         self._bind_worker(worker, self._populate_chapters)
 
     def _on_download_clicked(self) -> None:
-        selected = [
-            item.data(Qt.ItemDataRole.UserRole)
-            for i in range(self.chapter_list.count())
-            if (item := self.chapter_list.item(i)) and item.isSelected()
-        ]
+        # Qt reports selections in click order; sort so chapters download in reading order
+        rows = sorted(index.row() for index in self.chapter_list.selectionModel().selectedRows())
+        selected = [self.chapter_model.chapter(row) for row in rows]
         if not selected:
             self._show_error("Select at least one chapter.")
             return
-        worker = TaskRunnable(
+        worker = AsyncTask(
             run_download_job,
+            capture_logs=True,
             chapters=selected,
             threaded=self.threading_box.isChecked(),
             concurrency=self.concurrency_spin.value(),
@@ -325,17 +421,15 @@ class MangaParkWindow(QMainWindow):
         self._bind_worker(worker, lambda _: self._append_log("Download task finished."))
 
     def _populate_chapters(self, chapters: List[Dict[str, str]]) -> None:
-        self.chapter_list.clear()
-        for chapter in chapters:
-            item = QListWidgetItem(chapter["title"])
-            item.setData(Qt.ItemDataRole.UserRole, chapter)
-            self.chapter_list.addItem(item)
+        self.chapter_model.set_chapters(chapters)
         if chapters:
             self._append_log("Chapters ready. Select the ones to download.")
 
     def _open_downloads(self) -> None:
-        path = os.path.abspath("downloads")
-        os.makedirs(path, exist_ok=True)
+        # Created here rather than through the backend, whose first import would stall the GUI thread
+        downloads_dir = Path("downloads")
+        downloads_dir.mkdir(exist_ok=True)
+        path = str(downloads_dir.resolve())
         if sys.platform.startswith("win"):
             os.startfile(path)  # type: ignore[attr-defined]
         elif sys.platform == "darwin":
@@ -344,13 +438,26 @@ class MangaParkWindow(QMainWindow):
             subprocess.Popen(["xdg-open", path])
 
     def _append_log(self, text: str) -> None:
-        self.log_area.append(text)
-        self.log_area.ensureCursorVisible()
+        self._log_buffer.append(text)
+
+    def _flush_logs(self) -> None:
+        if not self._log_buffer:
+            return
+        chunk = "\n".join(self._log_buffer)
+        self._log_buffer.clear()
+        self._log_cursor.movePosition(QTextCursor.MoveOperation.End)
+        self._log_cursor.insertText(f"\n{chunk}" if not self.log_area.document().isEmpty() else chunk)
+        scrollbar = self.log_area.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
 
     def _show_error(self, message: str) -> None:
         self._append_log(message)
         QMessageBox.critical(self, "MangaPark Downloader", message)
 
+    def closeEvent(self, event) -> None:  # pylint: disable=invalid-name
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        super().closeEvent(event)
+
     def _set_busy(self, busy: bool) -> None:
         self.download_button.setDisabled(busy)
         self.open_folder_button.setDisabled(busy)
@@ -1,5 +1,25 @@
 """Reusable style definitions for the MangaPark GUI."""
-from PyQt6.QtGui import QColor, QPalette
+from PyQt6.QtGui import QBrush, QColor, QGradient, QLinearGradient, QPalette
+
+# (start, end) colour stops shared by the stylesheet and the palette brushes
+BUTTON_GRADIENT = ("#4f8bff", "#8a6bff")
+BUTTON_HOVER_GRADIENT = ("#6c9dff", "#a57cff")
+BUTTON_PRESSED_GRADIENT = ("#3d6fe3", "#7d57f2")
+PROGRESS_GRADIENT = ("#50b5ff", "#7a6bff")
+
+
+def _qss_gradient(stops):
+    return "qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 %s, stop:1 %s)" % stops
+
+
+def gradient_brush(stops):
+    """Diagonal gradient brush that stretches over whatever widget it fills."""
+    gradient = QLinearGradient(0, 0, 1, 1)
+    gradient.setCoordinateMode(QGradient.CoordinateMode.ObjectBoundingMode)
+    gradient.setColorAt(0, QColor(stops[0]))
+    gradient.setColorAt(1, QColor(stops[1]))
+    return QBrush(gradient)
+
 
 APP_STYLE = """
 QWidget {
@@ -8,7 +28,7 @@ QWidget {
     font-family: 'Segoe UI';
     font-size: 14px;
 }
-QLineEdit, QTextEdit, QListWidget, QComboBox, QSpinBox {
+QLineEdit, QTextEdit, QListView#ChapterList, QComboBox, QSpinBox {
     background-color: #151826;
     border: 1px solid #2a2f42;
     border-radius: 10px;
@@ -16,12 +36,11 @@ QLineEdit, QTextEdit, QListWidget, QComboBox, QSpinBox {
     selection-background-color: #5468ff;
     selection-color: #ffffff;
 }
-QLineEdit:focus, QTextEdit:focus, QListWidget:focus, QComboBox:focus, QSpinBox:focus {
+QLineEdit:focus, QTextEdit:focus, QListView#ChapterList:focus, QComboBox:focus, QSpinBox:focus {
     border: 1px solid #7183ff;
 }
 QPushButton {
-    background-color: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-        stop:0 #4f8bff, stop:1 #8a6bff);
+    background-color: %(button)s;
     border: none;
     border-radius: 12px;
     padding: 10px 18px;
@@ -29,12 +48,10 @@ QPushButton {
     color: #ffffff;
 }
 QPushButton:hover {
-    background-color: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-        stop:0 #6c9dff, stop:1 #a57cff);
+    background-color: %(button_hover)s;
 }
 QPushButton:pressed {
-    background-color: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-        stop:0 #3d6fe3, stop:1 #7d57f2);
+    background-color: %(button_pressed)s;
 }
 QProgressBar {
     background-color: #141726;
@@ -44,8 +61,7 @@ QProgressBar {
     height: 18px;
 }
 QProgressBar::chunk {
-    background-color: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-        stop:0 #50b5ff, stop:1 #7a6bff);
+    background-color: %(progress)s;
     border-radius: 10px;
 }
 QScrollBar:vertical, QScrollBar:horizontal {
@@ -60,12 +76,12 @@ QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
 QScrollBar::handle:vertical:hover, QScrollBar::handle:horizontal:hover {
     background: #3b4668;
 }
-QListWidget::item {
+QListView#ChapterList::item {
     padding: 10px;
     margin: 4px 6px;
     border-radius: 8px;
 }
-QListWidget::item:selected {
+QListView#ChapterList::item:selected {
     background: rgba(111, 135, 255, 0.35);
 }
 QLabel#TitleLabel {
@@ -90,7 +106,12 @@ QLabel#SectionLabel {
     margin-right: 8px;
     min-width: 120px;
 }
-"""
+""" % {
+    "button": _qss_gradient(BUTTON_GRADIENT),
+    "button_hover": _qss_gradient(BUTTON_HOVER_GRADIENT),
+    "button_pressed": _qss_gradient(BUTTON_PRESSED_GRADIENT),
+    "progress": _qss_gradient(PROGRESS_GRADIENT),
+}
 
 def apply_palette(app):
     """Tweak the base palette so dialogs inherit the dark theme."""
@@ -99,7 +120,7 @@ def apply_palette(app):
     palette.setColor(QPalette.ColorRole.Base, QColor("#151826"))
     palette.setColor(QPalette.ColorRole.AlternateBase, QColor("#1a1e2d"))
     palette.setColor(QPalette.ColorRole.Text, QColor("#f5f7ff"))
-    palette.setColor(QPalette.ColorRole.Button, QColor("#4f5dff"))
+    palette.setBrush(QPalette.ColorRole.Button, gradient_brush(BUTTON_GRADIENT))
     palette.setColor(QPalette.ColorRole.ButtonText, QColor("#ffffff"))
     palette.setColor(QPalette.ColorRole.Highlight, QColor("#5468ff"))
     app.setPalette(palette)
@@ -1,28 +1,200 @@
 # This script will download manga chapters from mangapark.net using Selenium
-import time
+import asyncio
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree, html as lxml_html
 import os
-from urllib.parse import urljoin
+import re
+import functools
+import logging
+import logging.handlers
+import sys
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from PIL import Image
 import io
+import json
+import contextlib
+import queue
+import struct
 import threading
 import concurrent.futures
 import zipfile
 import shutil
 import img2pdf
 
+logger = logging.getLogger("mangapark")
+
+# Sent once per session instead of on every request
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate',
+}
+# (connect, read) timeout in seconds for every HTTP request
+HTTP_TIMEOUT = (5, 30)
+
+# Image extensions (lowercase, no dot) packaged into CBZs, and the subset create_pdf can embed
+_IMG_EXTS = frozenset({'jpg', 'jpeg', 'png', 'webp', 'gif'})
+_PDF_EXTS = frozenset({'jpg', 'jpeg', 'png', 'webp'})  # img2pdf embeds all of these without re-encoding
+
+# Chapter links on a title page, and page images in the chapter reader
+_CHAPTER_SELECTOR = 'a.link-hover.link-primary.visited\\:text-accent'
+_IMG_SELECTOR = 'img.w-full.h-full'
+
+def create_http_session(pool_size=32):
+    """
+    Create a requests session whose connection pool can serve concurrent image downloads.
+    Transient failures (connection errors, 429 and 5xx gateway errors) are retried with backoff.
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# Shared by every synchronous page request so connections (and TLS sessions) to MangaPark are reused
+SESSION = create_http_session()
+
+@functools.lru_cache(maxsize=1)
+def ensure_downloads_dir():
+    """Create the downloads folder (once per process) and return its absolute path."""
+    downloads_dir = Path("downloads")
+    downloads_dir.mkdir(exist_ok=True)
+    return downloads_dir.resolve()
+
+def downloads_file(filename):
+    """
+    Return the path of filename inside the downloads folder, recreating the folder if it was deleted.
+    Chapter folders don't need this: os.makedirs recreates the downloads folder along with them.
+    """
+    downloads_dir = ensure_downloads_dir()
+    downloads_dir.mkdir(exist_ok=True)
+    return os.path.join(downloads_dir, filename)
+
+# MangaPark's frontend loads its data from this GraphQL endpoint; querying it directly needs no browser
+API_URL = "https://mangapark.net/apo/"
+API_HEADERS = {
+    'Content-Type': 'application/json',
+    'apollographql-client-name': 'mangapark-downloader',
+}
+CHAPTER_LIST_QUERY = """
+query get_comicChapterList($comicId: ID!) {
+  get_comicChapterList(comicId: $comicId) {
+    data { id dname title urlPath serial }
+  }
+}
+"""
+CHAPTER_NODE_QUERY = """
+query get_chapterNode($id: ID!) {
+  get_chapterNode(id: $id) {
+    data { imageFile { urlList } }
+  }
+}
+"""
+MANGA_ID_PATTERN = re.compile(r'/title/(\d+)')
+CHAPTER_ID_PATTERN = re.compile(r'/title/[^/]+/(\d+)')
+
+def api_payload(query, variables):
+    """Build the JSON body for a GraphQL request to the /apo/ endpoint."""
+    return {'query': query, 'variables': variables}
+
+def parse_chapter_list(manga_url, payload):
+    """
+    Turn a get_comicChapterList response into chapter dicts, ordered so chapter 1 is at index 0.
+    Raises ValueError if the response does not have the expected shape.
+    """
+    # Every node is read inside the try, so any change in the response shape becomes a ValueError
+    try:
+        nodes = [item['data'] for item in payload['data']['get_comicChapterList']]
+        chapters = []
+        for node in sorted(nodes, key=lambda n: float(n.get('serial') or 0)):
+            title = node['dname']
+            if node.get('title'):
+                title = f"{title} - {node['title']}"
+            chapters.append({'title': title, 'url': urljoin(manga_url, node['urlPath'])})
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"unexpected chapter list response: {e!r}") from e
+    return chapters
+
+def parse_chapter_images(payload):
+    """
+    Pull the page image URLs out of a get_chapterNode response.
+    Raises ValueError if the response does not have the expected shape.
+    """
+    try:
+        return list(payload['data']['get_chapterNode']['data']['imageFile']['urlList'])
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"unexpected chapter response: {e!r}") from e
+
+def fetch_chapters_api(manga_url, session=None):
+    """
+    Fetch a manga's chapter list from MangaPark's GraphQL API.
+    Returns None if the URL carries no manga id or the API call fails, so callers can fall back to scraping.
+    """
+    match = MANGA_ID_PATTERN.search(manga_url)
+    if not match:
+        return None
+
+    http = session or SESSION
+    try:
+        response = http.post(API_URL, json=api_payload(CHAPTER_LIST_QUERY, {'comicId': match.group(1)}),
+                             headers=API_HEADERS, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        chapters = parse_chapter_list(manga_url, response.json())
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.warning("Chapter API unavailable (%s), falling back to page scraping...", e)
+        return None
+
+    return chapters or None
+
+def fetch_chapter_images_api(chapter_url, session=None):
+    """
+    Fetch a chapter's image URLs from MangaPark's GraphQL API.
+    Returns an empty list if the URL carries no chapter id or the API call fails.
+    """
+    match = CHAPTER_ID_PATTERN.search(chapter_url)
+    if not match:
+        return []
+
+    http = session or SESSION
+    try:
+        response = http.post(API_URL, json=api_payload(CHAPTER_NODE_QUERY, {'id': match.group(1)}),
+                             headers=API_HEADERS, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return parse_chapter_images(response.json())
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.warning("Chapter API unavailable (%s), falling back to the chapter page...", e)
+        return []
+
+# Compiled once; equivalent to _CHAPTER_SELECTOR
+CHAPTER_LINK_XPATH = etree.XPath(
+    "//a[contains(concat(' ', normalize-space(@class), ' '), ' link-hover ')"
+    " and contains(concat(' ', normalize-space(@class), ' '), ' link-primary ')"
+    " and contains(concat(' ', normalize-space(@class), ' '), ' visited:text-accent ')]"
+)
+
 def get_chapter_info(manga_url, use_nsfw_mode=False):
     """Scrapes the manga page for chapter titles and URLs."""
-    print(f"Fetching chapter information from: {manga_url}")
+    logger.info("Fetching chapter information from: %s", manga_url)
+
+    # The API returns the full chapter list regardless of the site's content filter
+    chapters = fetch_chapters_api(manga_url)
+    if chapters:
+        logger.info("Found %d chapters via API", len(chapters))
+        return chapters
 
     if use_nsfw_mode:
-        print("Using NSFW mode (Selenium)...")
+        logger.info("Using NSFW mode (Selenium)...")
         driver = None
         try:
             # Initialize browser with NSFW settings enabled
@@ -31,15 +203,20 @@ def get_chapter_info(manga_url, use_nsfw_mode=False):
             # Navigate to the manga page
             driver.get(manga_url)
 
-            # Wait for the page to load and JavaScript to execute
-            print("Waiting for page to load...")
-            time.sleep(3)  # Reduced wait time for faster loading
+            # Wait until the chapter links have been rendered by JavaScript
+            logger.info("Waiting for page to load...")
+            try:
+                WebDriverWait(driver, 15).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, 'a.link-hover.link-primary'))
+                )
+            except TimeoutException:
+                logger.warning("Timed out waiting for chapter links, trying fallback selectors...")
 
             # Try to find chapter elements with multiple selectors
             chapter_elements = []
 
             # Primary selector based on the HTML structure
-            chapter_elements = driver.find_elements(By.CSS_SELECTOR, 'a.link-hover.link-primary.visited\\:text-accent')
+            chapter_elements = driver.find_elements(By.CSS_SELECTOR, _CHAPTER_SELECTOR)
 
             if not chapter_elements:
                 # Fallback selectors
@@ -54,20 +231,19 @@ def get_chapter_info(manga_url, use_nsfw_mode=False):
                 for selector in selectors_to_try:
                     chapter_elements = driver.find_elements(By.CSS_SELECTOR, selector)
                     if chapter_elements:
-                        print(f"Found chapters using selector: {selector}")
+                        logger.info("Found chapters using selector: %s", selector)
                         break
 
             if not chapter_elements:
-                print("No chapter elements found. Saving page source for debugging...")
+                logger.warning("No chapter elements found. Saving page source for debugging...")
                 # Save the page source for debugging
-                debug_file = os.path.join("downloads", "debug_page_selenium.html")
-                os.makedirs("downloads", exist_ok=True)
+                debug_file = downloads_file("debug_page_selenium.html")
                 with open(debug_file, 'w', encoding='utf-8') as f:
                     f.write(driver.page_source)
-                print(f"Debug page saved to: {debug_file}")
+                logger.info("Debug page saved to: %s", debug_file)
                 return None
 
-            print(f"Found {len(chapter_elements)} potential chapters")
+            logger.info("Found %d potential chapters", len(chapter_elements))
 
             chapters = []
             for element in chapter_elements:
@@ -92,7 +268,7 @@ def get_chapter_info(manga_url, use_nsfw_mode=False):
                     chapters.append({'title': title, 'url': url})
 
                 except Exception as e:
-                    print(f"Error processing chapter element: {e}")
+                    logger.error("Error processing chapter element: %s", e)
                     continue
 
             # Remove duplicates based on URL
@@ -108,45 +284,47 @@ def get_chapter_info(manga_url, use_nsfw_mode=False):
             # Reverse the chapters list so chapter 1 is at index 0
             chapters.reverse()
 
-            print(f"Found {len(chapters)} unique chapters")
+            logger.info("Found %d unique chapters", len(chapters))
             return chapters
 
         except Exception as e:
-            print(f"Error in Selenium processing: {e}")
+            logger.error("Error in Selenium processing: %s", e)
             return None
         finally:
             if driver:
                 driver.quit()
     else:
-        print("Using SFW mode (requests + BeautifulSoup)...")
+        logger.info("Using SFW mode (requests + lxml)...")
         return get_chapter_info_sfw(manga_url)
 
 def get_chapter_info_sfw(manga_url):
-    """Scrapes the manga page for chapter titles and URLs using requests + BeautifulSoup (SFW mode)."""
-    print(f"Fetching chapter information from: {manga_url}")
+    """Scrapes the manga page for chapter titles and URLs using requests + lxml (SFW mode)."""
+    logger.info("Fetching chapter information from: %s", manga_url)
     try:
-        response = requests.get(manga_url)
+        response = SESSION.get(manga_url, timeout=HTTP_TIMEOUT)
         response.raise_for_status()  # Raise an exception for bad status codes
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # lxml's C parser is far faster than BeautifulSoup's html.parser on large title pages
+        root = lxml_html.fromstring(response.text)
 
         chapters = []
-        chapter_elements = soup.select('a.link-hover.link-primary.visited\\:text-accent')
+        chapter_elements = CHAPTER_LINK_XPATH(root)
 
         if not chapter_elements:
-            print("No chapter elements found. Saving page for debugging...")
+            logger.warning("No chapter elements found. Saving page for debugging...")
             # Save the page for debugging
-            debug_file = os.path.join("downloads", "debug_page_sfw.html")
-            os.makedirs("downloads", exist_ok=True)
+            debug_file = downloads_file("debug_page_sfw.html")
             with open(debug_file, 'w', encoding='utf-8') as f:
-                f.write(str(soup.prettify()))
-            print(f"Debug page saved to: {debug_file}")
+                f.write(response.text)  # Raw source; re-formatting a multi-MB page is slow and adds nothing
+            logger.info("Debug page saved to: %s", debug_file)
             return None
 
-        print(f"Found {len(chapter_elements)} potential chapters")
+        logger.info("Found %d potential chapters", len(chapter_elements))
 
         for chapter_element in chapter_elements:
-            title = chapter_element.get_text(strip=True)
-            href = chapter_element['href']
+            title = ''.join(text.strip() for text in chapter_element.itertext())
+            href = chapter_element.get('href')
+            if not href:
+                continue
 
             # Construct absolute URL - handle both relative and absolute URLs
             if href.startswith('http'):
@@ -169,38 +347,146 @@ def get_chapter_info_sfw(manga_url):
         # Reverse the chapters list so chapter 1 is at index 0
         chapters.reverse()
 
-        print(f"Found {len(chapters)} unique chapters")
+        logger.info("Found %d unique chapters", len(chapters))
         return chapters
 
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching manga page: {e}")
+        logger.error("Error fetching manga page: %s", e)
+        return None
+    except (etree.ParserError, ValueError) as e:
+        # e.g. an empty 200 response, which lxml refuses to parse
+        logger.error("Error parsing manga page: %s", e)
         return None
 
-def is_valid_manga_image(img_data, min_width=400, min_height=400, min_aspect_ratio=1.2):
+# Page images are served from MangaPark's media CDN paths; they also appear in the page's embedded JSON
+IMAGE_URL_PATTERN = re.compile(r'https?://[^"\'\s<>]+?/media/[^"\'\s<>]+?\.(?:jpe?g|png|webp|gif)(?:\?[^"\'\s<>]*)?', re.IGNORECASE)
+
+# Compiled once; the src of every element matching _IMG_SELECTOR
+IMAGE_SRC_XPATH = etree.XPath(
+    "//img[contains(concat(' ', normalize-space(@class), ' '), ' w-full ')"
+    " and contains(concat(' ', normalize-space(@class), ' '), ' h-full ')]/@src"
+)
+
+def extract_image_urls(html, page_url):
+    """
+    Extract chapter image URLs from a chapter page's HTML without running its JavaScript.
+    Looks at rendered <img> tags first, then at image URLs embedded in the page's JSON state.
+    Relative and protocol-relative sources are resolved against page_url; data: placeholders are skipped.
+    """
+    try:
+        image_urls = [
+            urljoin(page_url, str(src).strip()) for src in IMAGE_SRC_XPATH(lxml_html.fromstring(html))
+            if src.strip() and not src.strip().lower().startswith('data:')
+        ]
+    except (etree.ParserError, ValueError):
+        image_urls = []  # Empty or unparsable page; the regex below may still find something
+
+    if not image_urls:
+        image_urls = IMAGE_URL_PATTERN.findall(html)
+
+    # Remove duplicates while keeping page order
+    return list(dict.fromkeys(image_urls))
+
+def discover_image_urls(chapter_url, session=None):
+    """
+    Fetch a chapter's image URLs over plain HTTP: from the GraphQL API, else from the page HTML.
+    Returns an empty list if the page could not be fetched or exposes no images.
+    """
+    image_urls = fetch_chapter_images_api(chapter_url, session)
+    if image_urls:
+        return image_urls
+
+    http = session or SESSION
+    try:
+        response = http.get(chapter_url, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.error("Error fetching chapter page: %s", e)
+        return []
+    return extract_image_urls(response.text, response.url)
+
+# JPEG start-of-frame markers (SOF0-SOF15, minus DHT/JPG/DAC which share the range)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def get_image_size(img_data):
+    """
+    Read (width, height) straight from an image's header bytes, without decoding any pixels.
+    Handles PNG, GIF, WebP and JPEG; anything else falls back to Pillow.
+    """
+    if img_data[:8] == b'\x89PNG\r\n\x1a\n' and img_data[12:16] == b'IHDR':
+        return struct.unpack('>II', img_data[16:24])
+
+    if img_data[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', img_data[6:10])
+
+    if img_data[:4] == b'RIFF' and img_data[8:12] == b'WEBP':
+        chunk = img_data[12:16]
+        if chunk == b'VP8 ':  # Lossy: 14-bit dimensions after the frame tag and start code
+            width, height = struct.unpack('<HH', img_data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b'VP8L':  # Lossless: width-1 and height-1 packed as 14-bit fields
+            bits = int.from_bytes(img_data[21:25], 'little')
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b'VP8X':  # Extended: 24-bit canvas width-1 and height-1
+            return int.from_bytes(img_data[24:27], 'little') + 1, int.from_bytes(img_data[27:30], 'little') + 1
+
+    if img_data[:2] == b'\xff\xd8':
+        # Walk the marker segments until the frame header, which holds the dimensions
+        offset = 2
+        while offset + 9 <= len(img_data) and img_data[offset] == 0xFF:
+            marker = img_data[offset + 1]
+            if marker == 0xFF:  # Fill byte
+                offset += 1
+            elif marker in JPEG_SOF_MARKERS:
+                height, width = struct.unpack('>HH', img_data[offset + 5:offset + 9])
+                return width, height
+            elif marker == 0x01 or 0xD0 <= marker <= 0xD8:  # Markers without a length field
+                offset += 2
+            else:
+                offset += 2 + struct.unpack('>H', img_data[offset + 2:offset + 4])[0]
+
+    with Image.open(io.BytesIO(img_data)) as img:
+        return img.size
+
+# Files at or below this size are icons or placeholders, never pages
+MIN_PAGE_BYTES = 30 * 1024
+
+def is_valid_manga_image(img_data, min_width=400, min_height=400, min_aspect_ratio=1.2, file_size=None, img_path=None):
     """
     Check if an image is a valid manga page (not an icon or small image).
+    img_data only needs to hold the start of the file when file_size gives the full size;
+    if its dimensions lie beyond those bytes they are read from the file at img_path instead.
     """
     try:
-        img = Image.open(io.BytesIO(img_data))
-        width, height = img.size
+        # Calculate image size in KB
+        img_size_kb = (len(img_data) if file_size is None else file_size) / 1024
+
+        # Icons are tiny files (most manga pages are at least 30KB), so reject them before parsing anything
+        if img_size_kb <= MIN_PAGE_BYTES / 1024:
+            logger.debug("Image rejected: file size too small (%.2fKB)", img_size_kb)
+            return False
+
+        try:
+            width, height = get_image_size(img_data)
+        except Exception:
+            if img_path is None:
+                raise
+            # A JPEG's metadata segments can push its frame header past the buffered bytes
+            with Image.open(img_path) as img:
+                width, height = img.size
         
         # Calculate aspect ratio (always >= 1.0)
         aspect_ratio = max(width / height, height / width)
         
-        # Calculate image size in KB
-        img_size_kb = len(img_data) / 1024
-        
         # Debug information
-        print(f"Image dimensions: {width}x{height}, Aspect ratio: {aspect_ratio:.2f}, Size: {img_size_kb:.2f}KB")
+        logger.debug("Image dimensions: %dx%d, Aspect ratio: %.2f, Size: %.2fKB", width, height, aspect_ratio, img_size_kb)
         
-        # Criteria for a valid manga page:
+        # Criteria for a valid manga page (file size, checked above, must also be substantial):
         # 1. Width and height both exceed minimums
         # 2. Aspect ratio exceeds minimum (manga pages are typically rectangular)
-        # 3. File size is substantial (icons are typically small files)
         is_valid = (width > min_width and 
                    height > min_height and 
-                   aspect_ratio >= min_aspect_ratio and
-                   img_size_kb > 30)  # Most manga pages are at least 30KB
+                   aspect_ratio >= min_aspect_ratio)
         
         if not is_valid:
             reasons = []
@@ -208,93 +494,214 @@ def is_valid_manga_image(img_data, min_width=400, min_height=400, min_aspect_rat
                 reasons.append(f"too small (minimum {min_width}x{min_height})")
             if aspect_ratio < min_aspect_ratio:
                 reasons.append(f"too square-like (minimum aspect ratio {min_aspect_ratio})")
-            if img_size_kb <= 30:
-                reasons.append("file size too small")
             
-            print(f"Image rejected: {', '.join(reasons)}")
+            logger.debug("Image rejected: %s", ', '.join(reasons))
         
         return is_valid
     except Exception as e:
-        print(f"Error checking image dimensions: {e}")
+        logger.error("Error checking image dimensions: %s", e)
         # If we can't check, assume it's not valid to be safe
         return False
 
-def download_image(img_url, referer, img_index, chapter_dir, chapter_title):
+# Leading bytes kept in memory for validation; covers almost every page header, and pages whose
+# dimensions come later (JPEGs with several large EXIF/ICC/XMP segments) are read back from disk
+IMAGE_HEADER_BYTES = 64 * 1024
+
+def image_extension(img_url):
+    """Return the file extension to save an image URL under (jpg if unrecognised)."""
+    # Taken from the URL path only, so query strings and dots in the hostname are ignored
+    extension = os.path.splitext(urlparse(img_url).path)[1][1:].lower()
+    if extension not in _IMG_EXTS:
+        extension = 'jpg'  # Default to jpg if extension is not recognized
+    return extension
+
+# Hidden per-chapter file recording each saved page's source URL, HTTP validators and size
+PAGES_MANIFEST = ".pages.json"
+
+def read_pages_manifest(chapter_dir):
+    """Return the page records saved for a chapter folder, keyed by file name (empty if there are none)."""
+    try:
+        with open(os.path.join(chapter_dir, PAGES_MANIFEST), encoding='utf-8') as f:
+            pages = json.load(f)
+        return pages if isinstance(pages, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def write_pages_manifest(chapter_dir, pages):
+    with open(os.path.join(chapter_dir, PAGES_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(pages, f)
+
+def existing_file_size(path):
+    """Return the size of path, or 0 if it does not exist."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def remove_image(img_path):
+    """Delete a downloaded image, ignoring one that is already gone."""
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(img_path)
+
+async def download_image_async(session, img_url, referer, img_index, chapter_dir, chapter_title, page=None):
     """
-    Download a single image.
-    Returns a tuple of (img_index, img_path, success) to maintain order.
+    Download a single image over a shared aiohttp session, streaming the body straight to disk.
+    Pages left complete by an earlier run (page is their record from the chapter manifest) are reused:
+    skipped outright, or revalidated with a conditional GET when the server gave an ETag/Last-Modified.
+    All file access runs in worker threads so the event loop keeps servicing the other downloads.
+    Returns a tuple of (img_index, img_path, success, page record to save in the manifest or None) to maintain order.
     """
+    # The page index is the final file name, so pages sort in order without a rename pass;
+    # skipped icons just leave a gap in the numbering
+    img_path = os.path.join(chapter_dir, f"{img_index+1:03d}.{image_extension(img_url)}")
+    request_headers = {'Referer': referer}
+    writing = False
     try:
-        print(f"[{chapter_title}] Downloading image {img_index+1}")
-        
-        # Download the image
-        img_response = requests.get(img_url, headers={'Referer': referer})
-        img_response.raise_for_status()
-        
-        # Check if this is a valid manga image (not an icon)
-        if not is_valid_manga_image(img_response.content):
-            print(f"[{chapter_title}] Skipping image {img_index+1} as it appears to be an icon or small image")
-            return (img_index, None, False)
-        
-        # Save the image
-        extension = img_url.split('.')[-1].split('?')[0].lower()  # Get file extension
-        # Support multiple image formats
-        if extension not in ['jpg', 'jpeg', 'png', 'webp', 'gif']:
-            extension = 'jpg'  # Default to jpg if extension is not recognized
-        
-        img_path = os.path.join(chapter_dir, f"temp_{img_index:03d}.{extension}")
-        with open(img_path, 'wb') as f:
-            f.write(img_response.content)
-            
-        print(f"[{chapter_title}] Downloaded image {img_index+1}")
-        return (img_index, img_path, True)
+        # Only files with a matching record are reused: older runs numbered pages differently, and a
+        # record whose size doesn't match marks a download that was interrupted mid-body. The URL
+        # path is compared rather than the full URL because MangaPark rotates its image hosts.
+        if page and page.get('url') and urlparse(page['url']).path == urlparse(img_url).path:
+            existing_size = await asyncio.to_thread(existing_file_size, img_path)
+            if existing_size > MIN_PAGE_BYTES and page.get('size') == existing_size:
+                if not (page.get('etag') or page.get('last_modified')):
+                    logger.debug("[%s] Image %d already downloaded", chapter_title, img_index+1)
+                    return (img_index, img_path, True, page)
+                if page.get('etag'):
+                    request_headers['If-None-Match'] = page['etag']
+                if page.get('last_modified'):
+                    request_headers['If-Modified-Since'] = page['last_modified']
+            else:
+                page = None
+        else:
+            page = None
+
+        logger.debug("[%s] Downloading image %d", chapter_title, img_index+1)
+
+        # Stream into the chapter folder, keeping only the header in memory for validation
+        header = bytearray()
+        file_size = 0
+        async with session.get(img_url, headers=request_headers) as img_response:
+            if img_response.status == 304:
+                logger.debug("[%s] Image %d not modified, keeping existing file", chapter_title, img_index+1)
+                return (img_index, img_path, True, page)
+            img_response.raise_for_status()
+
+            writing = True
+            f = await asyncio.to_thread(open, img_path, 'wb')
+            try:
+                async for chunk in img_response.content.iter_chunked(64 * 1024):
+                    if len(header) < IMAGE_HEADER_BYTES:
+                        header += chunk[:IMAGE_HEADER_BYTES - len(header)]
+                    await asyncio.to_thread(f.write, chunk)
+                    file_size += len(chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+
+        # Check if this is a valid manga image (not an icon). Header parsing (and the Pillow
+        # fallback for unknown formats) runs in a worker thread so the event loop keeps
+        # servicing the other downloads' sockets meanwhile
+        is_valid = await asyncio.to_thread(is_valid_manga_image, bytes(header), file_size=file_size, img_path=img_path)
+        if not is_valid:
+            logger.debug("[%s] Skipping image %d as it appears to be an icon or small image", chapter_title, img_index+1)
+            await asyncio.to_thread(remove_image, img_path)
+            return (img_index, None, False, None)
+
+        logger.debug("[%s] Downloaded image %d", chapter_title, img_index+1)
+        page = {
+            'url': img_url,
+            'etag': img_response.headers.get('ETag'),
+            'last_modified': img_response.headers.get('Last-Modified'),
+            'size': file_size,
+        }
+        return (img_index, img_path, True, page)
     except Exception as e:
-        print(f"[{chapter_title}] Error downloading image {img_index+1}: {e}")
-        return (img_index, None, False)
+        logger.error("[%s] Error downloading image %d: %s", chapter_title, img_index+1, e)
+        # A failed revalidation leaves the previously downloaded file (and its record) alone
+        if writing:
+            await asyncio.to_thread(remove_image, img_path)
+            return (img_index, None, False, None)
+        return (img_index, None, False, page)
+
+def create_aiohttp_session(max_concurrent_downloads=5):
+    """
+    Create an aiohttp session whose keep-alive pool holds at most max_concurrent_downloads connections per host.
+    Must be called (and closed) inside a running event loop.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=max_concurrent_downloads, limit_per_host=max_concurrent_downloads, ttl_dns_cache=300
+    )
+    timeout = aiohttp.ClientTimeout(sock_connect=HTTP_TIMEOUT[0], sock_read=HTTP_TIMEOUT[1])
+    return aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS, timeout=timeout)
+
+async def download_images_async(image_urls, referer, chapter_dir, chapter_title, max_concurrent_downloads=5, session=None):
+    """
+    Download all of a chapter's images concurrently on one event loop.
+    Uses the given aiohttp session, or a temporary one sized to max_concurrent_downloads.
+    Returns the number of valid images saved.
+    """
+    if session is None:
+        async with create_aiohttp_session(max_concurrent_downloads) as session:
+            return await download_images_async(image_urls, referer, chapter_dir, chapter_title, session=session)
+
+    pages = await asyncio.to_thread(read_pages_manifest, chapter_dir)
+    results = await asyncio.gather(*[
+        download_image_async(
+            session, img_url, referer, i, chapter_dir, chapter_title,
+            pages.get(f"{i+1:03d}.{image_extension(img_url)}")
+        )
+        for i, img_url in enumerate(image_urls)
+    ])
+
+    # One manifest write per chapter, recording every page that is on disk now
+    pages = {os.path.basename(img_path): page for _, img_path, _, page in results if img_path and page}
+    await asyncio.to_thread(write_pages_manifest, chapter_dir, pages)
+    return sum(1 for r in results if r[2])
+
+NSFW_RADIO_SELECTOR = 'input[type="radio"][name="safe_reading"][value="2"]'
 
 def enable_nsfw_settings(driver):
     """Enable NSFW settings in MangaPark - MUST be called before any manga operations."""
     try:
-        print("Enabling NSFW settings...")
+        logger.info("Enabling NSFW settings...")
         driver.get("https://mangapark.net/site-settings?group=safeBrowsing")
 
-        # Wait for the page to load
-        time.sleep(1)  # Reduced wait time
-
-        # Find and click the NSFW radio button
-        nsfw_radio = WebDriverWait(driver, 5).until(  # Reduced timeout
-            EC.element_to_be_clickable((By.CSS_SELECTOR, 'input[type="radio"][name="safe_reading"][value="2"]'))
+        # Find and click the NSFW radio button once it is clickable
+        nsfw_radio = WebDriverWait(driver, 5).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, NSFW_RADIO_SELECTOR))
         )
 
         # Click the NSFW option
         nsfw_radio.click()
-        print("NSFW settings enabled successfully")
+        logger.info("NSFW settings enabled successfully")
 
-        # Wait a moment for the setting to be applied
-        time.sleep(2)  # Wait for NSFW setting to take effect
+        # Wait until the setting has actually been applied
+        WebDriverWait(driver, 5).until(
+            lambda d: d.execute_script("return document.querySelector(arguments[0]).checked", NSFW_RADIO_SELECTOR)
+        )
 
         return True
     except Exception as e:
-        print(f"Error enabling NSFW settings: {e}")
+        logger.error("Error enabling NSFW settings: %s", e)
         return False
 
-def initialize_browser_with_nsfw():
-    """Initialize browser and enable NSFW settings globally (for chapter scraping only)."""
-    print("Initializing browser with NSFW settings...")
+# Requests chapter pages never need: stylesheets, web fonts and trackers
+BLOCKED_URL_PATTERNS = ['*.css', '*/fonts/*', '*.woff', '*.woff2', '*analytics*', '*googletag*', '*doubleclick*']
 
-    # Setup Chrome options for faster performance
+def create_chrome_options():
+    """Chrome options shared by every browser this script starts: headless and stripped of background work."""
     chrome_options = Options()
-    chrome_options.add_argument("--non-headless")  # Run in headless mode for speed
+    chrome_options.add_argument("--headless=new")  # Run in headless mode for speed
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--window-size=1920,1080")
     chrome_options.add_argument("--disable-web-security")
     chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-    chrome_options.add_argument("--disable-images")  # Disable images for faster loading
     chrome_options.add_argument("--disable-plugins")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-extensions")
     chrome_options.add_argument("--disable-default-apps")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-sync")
     chrome_options.add_argument("--disable-background-timer-throttling")
     chrome_options.add_argument("--disable-renderer-backgrounding")
     chrome_options.add_argument("--disable-backgrounding-occluded-windows")
@@ -302,254 +709,437 @@ def initialize_browser_with_nsfw():
 
     # Set eager page load strategy for faster loading
     chrome_options.page_load_strategy = 'eager'
+    return chrome_options
+
+def initialize_browser_with_nsfw():
+    """Initialize browser and enable NSFW settings globally (for chapter scraping only)."""
+    logger.info("Initializing browser with NSFW settings...")
+
+    chrome_options = create_chrome_options()
+    # Chapter listing only reads the DOM, so images are never fetched or decoded
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
 
     driver = webdriver.Chrome(options=chrome_options)
 
     # Enable NSFW settings first
     nsfw_enabled = enable_nsfw_settings(driver)
     if not nsfw_enabled:
-        print("Warning: Could not enable NSFW settings, may not be able to access NSFW content")
+        logger.warning("Could not enable NSFW settings, may not be able to access NSFW content")
 
     return driver
 
 def initialize_browser():
     """Initialize browser without NSFW settings (for downloads only)."""
-    print("Initializing browser for downloads...")
-
-    # Setup Chrome options for faster performance
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run in headless mode for speed
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--disable-web-security")
-    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-default-apps")
-    chrome_options.add_argument("--disable-background-timer-throttling")
-    chrome_options.add_argument("--disable-renderer-backgrounding")
-    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-    chrome_options.add_argument("--disable-ipc-flooding-protection")
+    logger.info("Initializing browser for downloads...")
 
-    # Set eager page load strategy for faster loading
-    chrome_options.page_load_strategy = 'eager'
+    driver = webdriver.Chrome(options=create_chrome_options())
 
-    driver = webdriver.Chrome(options=chrome_options)
+    # Page images stay enabled so lazy-loaded <img> tags still get their URLs, but styling,
+    # fonts and trackers are blocked at the network layer
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        logger.warning("Could not block page resources: %s", e)
     return driver
 
-def download_chapter_with_selenium(chapter_url, chapter_title, max_concurrent_downloads=5):
-    """Downloads images for a single chapter using Selenium."""
-    print(f"Downloading chapter: {chapter_title}")
+class DriverPool:
+    """
+    Bounded pool of download browsers that are started once and leased out one chapter at a time,
+    so Chrome's multi-second startup is paid per worker rather than per chapter.
+    Browsers are only started when a chapter actually needs one.
+    """
+
+    def __init__(self, size, factory=initialize_browser):
+        self.size = size
+        self.factory = factory
+        self._idle = []
+        self._drivers = []
+        # Signalled whenever a driver is returned or a slot is freed
+        self._available = threading.Condition()
+
+    def acquire(self):
+        """Take an idle driver, starting a new one if the pool isn't full yet, else wait for one."""
+        with self._available:
+            while not self._idle and len(self._drivers) >= self.size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._drivers.append(None)  # Reserve the slot while the browser starts
+
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._available:
+                self._drivers.remove(None)
+                self._available.notify()
+            raise
+        with self._available:
+            self._drivers[self._drivers.index(None)] = driver
+        return driver
+
+    def release(self, driver):
+        """Return a healthy driver to the pool with a clean cookie jar."""
+        try:
+            driver.delete_all_cookies()
+        except Exception as e:
+            logger.error("Error resetting browser: %s", e)
+            self.discard(driver)
+            return
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+
+    def discard(self, driver):
+        """Quit a driver that errored, freeing its slot for a fresh one."""
+        with self._available:
+            self._drivers.remove(driver)
+            self._available.notify()
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.error("Error closing browser: %s", e)
+
+    @contextlib.contextmanager
+    def lease(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        except Exception:
+            self.discard(driver)
+            raise
+        else:
+            self.release(driver)
+
+    def close(self):
+        """Quit every browser the pool started."""
+        with self._available:
+            drivers, self._drivers = [d for d in self._drivers if d is not None], []
+            self._idle = []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.error("Error closing browser: %s", e)
 
-    # Create directory for the chapter
-    chapter_dir = os.path.join("downloads", chapter_title.replace('/', '-').replace('\\', '-').replace(':', '-'))
+def make_chapter_dir(chapter_title):
+    """Create (if needed) and return the download directory for a chapter."""
+    chapter_dir = os.path.join(ensure_downloads_dir(), chapter_title.replace('/', '-').replace('\\', '-').replace(':', '-'))
     os.makedirs(chapter_dir, exist_ok=True)
+    return chapter_dir
 
-    driver = None
+IMAGE_URLS_SCRIPT = """
+let images = document.querySelectorAll(arguments[0]);
+if (!images.length) images = document.querySelectorAll('main img');
+return Array.from(images).map(e => e.currentSrc || e.src).filter(Boolean);
+"""
 
-    try:
-        # Construct the absolute chapter URL
-        base_url = "https://mangapark.net"
-        absolute_chapter_url = urljoin(base_url, chapter_url)
+def get_chapter_image_urls(chapter_url, chapter_title, chapter_dir, driver_pool=None):
+    """
+    Load a chapter page with Selenium and collect its image URLs.
+    Uses a browser leased from driver_pool, or a single-use one if no pool is given.
+    Returns a tuple of (absolute_chapter_url, image_urls); image_urls is empty if none were found.
+    """
+    # Construct the absolute chapter URL
+    base_url = "https://mangapark.net"
+    absolute_chapter_url = urljoin(base_url, chapter_url)
 
-        # Initialize browser without NSFW settings (downloads don't need NSFW)
-        driver = initialize_browser()
+    # Browsers come without NSFW settings (downloads don't need NSFW)
+    own_pool = driver_pool is None
+    if own_pool:
+        driver_pool = DriverPool(1)
 
-        # Navigate to the chapter
-        driver.get(absolute_chapter_url)
+    try:
+        with driver_pool.lease() as driver:
+            # Navigate to the chapter
+            driver.get(absolute_chapter_url)
 
-        # Wait for the page to load
-        print(f"[{chapter_title}] Waiting for page to load...")
-        time.sleep(5)  # Initial wait
-        
-        # Wait for images to load
-        try:
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "img.w-full.h-full"))
-            )
-            print(f"[{chapter_title}] Images loaded successfully")
-        except Exception as e:
-            print(f"[{chapter_title}] Timeout waiting for images: {e}")
-            # Continue anyway, some images might have loaded
-        
-        # Find all image elements
-        image_elements = driver.find_elements(By.CSS_SELECTOR, "img.w-full.h-full")
-        
-        if not image_elements:
-            # Try alternative selectors
-            image_elements = driver.find_elements(By.CSS_SELECTOR, "main img")
-        
-        if not image_elements:
-            print(f"[{chapter_title}] No images found. Saving page source for debugging...")
-            with open(os.path.join(chapter_dir, "debug_page.html"), 'w', encoding='utf-8') as f:
-                f.write(driver.page_source)
-            return chapter_dir, False
-        
-        print(f"[{chapter_title}] Found {len(image_elements)} images")
-        
-        # Get all image URLs first
-        image_urls = []
-        for img in image_elements:
-            img_url = img.get_attribute('src')
-            if img_url:
-                image_urls.append(img_url)
-        
-        # Download images with controlled concurrency
-        results = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrent_downloads) as executor:
-            # Submit all image downloads to the executor
-            future_to_index = {
-                executor.submit(download_image, img_url, absolute_chapter_url, i, chapter_dir, chapter_title): i
-                for i, img_url in enumerate(image_urls)
-            }
-            
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_index):
-                result = future.result()  # (img_index, img_path, success)
-                if result[2]:  # If successful
-                    results.append(result)
-        
-        # Sort results by original image index to maintain order
-        results.sort(key=lambda x: x[0])
+            # Wait for images to load
+            logger.info("[%s] Waiting for page to load...", chapter_title)
+            try:
+                WebDriverWait(driver, 20).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, _IMG_SELECTOR))
+                )
+                logger.info("[%s] Images loaded successfully", chapter_title)
+            except Exception as e:
+                logger.warning("[%s] Timeout waiting for images: %s", chapter_title, e)
+                # Continue anyway, some images might have loaded
         
-        # Rename files to their final sequential names
-        valid_images_count = 0
-        valid_image_paths = []
-        for _, temp_path, _ in results:
-            if temp_path:
-                valid_images_count += 1
-                extension = os.path.splitext(temp_path)[1]
-                final_path = os.path.join(chapter_dir, f"{valid_images_count:03d}{extension}")
-                os.rename(temp_path, final_path)
-                valid_image_paths.append(final_path)
+            # Collect every image URL in a single WebDriver call instead of one get_attribute per image;
+            # "main img" is only used when the reader images are missing
+            image_urls = driver.execute_script(IMAGE_URLS_SCRIPT, _IMG_SELECTOR)
         
-        print(f"[{chapter_title}] Chapter downloaded successfully with {valid_images_count} valid images")
-        return chapter_dir, valid_images_count > 0
+            if not image_urls:
+                logger.warning("[%s] No images found. Saving page source for debugging...", chapter_title)
+                with open(os.path.join(chapter_dir, "debug_page.html"), 'w', encoding='utf-8') as f:
+                    f.write(driver.page_source)
+                return absolute_chapter_url, []
         
-    except Exception as e:
-        print(f"[{chapter_title}] Error in Selenium processing: {e}")
-        return chapter_dir, False
+            logger.info("[%s] Found %d images", chapter_title, len(image_urls))
+
+            return absolute_chapter_url, image_urls
     finally:
-        if driver:
-            driver.quit()
+        if own_pool:
+            driver_pool.close()
+
+def resolve_chapter_images(chapter_url, chapter_title, driver_pool=None):
+    """
+    Find a chapter's image URLs: from the GraphQL API, else the page HTML, else Selenium
+    (a browser from driver_pool, if given). Every downloader discovers chapters through here.
+    Returns a tuple of (absolute_chapter_url, chapter_dir, image_urls); image_urls is empty if none were found.
+    """
+    chapter_dir = make_chapter_dir(chapter_title)
+    absolute_chapter_url = urljoin("https://mangapark.net", chapter_url)
+    image_urls = discover_image_urls(absolute_chapter_url)
+    if image_urls:
+        logger.info("[%s] Found %d images", chapter_title, len(image_urls))
+        return absolute_chapter_url, chapter_dir, image_urls
+
+    logger.warning("[%s] No images in page HTML, falling back to Selenium...", chapter_title)
+    absolute_chapter_url, image_urls = get_chapter_image_urls(chapter_url, chapter_title, chapter_dir, driver_pool)
+    return absolute_chapter_url, chapter_dir, image_urls
+
+async def download_chapters_async(chapters_to_download, max_concurrent_downloads=5, on_chapter_done=None):
+    """
+    Download multiple chapters on a single asyncio event loop. Up to max_concurrent_downloads chapters
+    are in flight at once, so one chapter's images download while the next is still being resolved,
+    and every image shares one aiohttp session capped at max_concurrent_downloads connections per host.
+    
+    Args:
+        chapters_to_download: List of chapter dictionaries to download
+        max_concurrent_downloads: Maximum number of concurrent chapters and connections per host (1 for sequential)
+        on_chapter_done: Optional callback receiving (chapter, chapter_dir, success) as each chapter finishes.
+            It runs on the event loop, so it should hand slow work off rather than do it inline.
+    Returns a list of (chapter_dir, chapter_title) for the chapters that downloaded successfully.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrent_downloads)
+    # Browsers only start for chapters that need the Selenium fallback
+    driver_pool = DriverPool(max_concurrent_downloads)
+    # Discovery can block for seconds in Selenium, so it gets its own threads; on the loop's default
+    # executor it could occupy every thread and stall the page validation that also runs there
+    discovery_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_concurrent_downloads, thread_name_prefix="discovery"
+    )
+
+    async def download_chapter(session, chapter):
+        chapter_title = chapter['title']
+        chapter_dir = None
+        async with semaphore:
+            try:
+                absolute_chapter_url, chapter_dir, image_urls = await loop.run_in_executor(
+                    discovery_executor, resolve_chapter_images, chapter['url'], chapter_title, driver_pool
+                )
+                if not image_urls:
+                    return chapter_dir, False
+
+                logger.info("Downloading chapter: %s", chapter_title)
+                valid_images_count = await download_images_async(
+                    image_urls, absolute_chapter_url, chapter_dir, chapter_title, session=session
+                )
+                logger.info("[%s] Chapter downloaded successfully with %d valid images", chapter_title, valid_images_count)
+                return chapter_dir, valid_images_count > 0
+
+            except Exception as e:
+                logger.error("[%s] Error downloading chapter: %s", chapter_title, e)
+                return chapter_dir, False
+
+    try:
+        async with create_aiohttp_session(max_concurrent_downloads) as session:
+            async def run(chapter):
+                chapter_dir, success = await download_chapter(session, chapter)
+                if success:
+                    logger.info("Completed download of chapter: %s", chapter['title'])
+                else:
+                    logger.warning("Chapter download completed but may have issues: %s", chapter['title'])
+                if on_chapter_done:
+                    on_chapter_done(chapter, chapter_dir, success)
+                return chapter_dir, success
+
+            results = await asyncio.gather(*[run(chapter) for chapter in chapters_to_download])
+    finally:
+        await loop.run_in_executor(discovery_executor, driver_pool.close)
+        discovery_executor.shutdown(wait=False)
+
+    return [
+        (chapter_dir, chapter['title'])
+        for chapter, (chapter_dir, success) in zip(chapters_to_download, results)
+        if success
+    ]
+
+def download_chapters_threaded(chapters_to_download, max_concurrent_downloads=5, on_chapter_done=None):
+    """
+    Blocking front end to download_chapters_async for the CLI.
+    on_chapter_done runs in its own thread, one chapter at a time, so slow work such as CBZ/PDF
+    conversion overlaps the remaining downloads instead of stalling the event loop.
+    """
+    if on_chapter_done is None:
+        return asyncio.run(download_chapters_async(chapters_to_download, max_concurrent_downloads))
+
+    done_queue = queue.Queue()
+
+    def finish():
+        while True:
+            result = done_queue.get()
+            if result is None:
+                break
+            try:
+                on_chapter_done(*result)
+            except Exception as e:
+                logger.error("Error processing chapter %s: %s", result[0]['title'], e)
+
+    finisher = threading.Thread(target=finish)
+    finisher.start()
+    try:
+        return asyncio.run(download_chapters_async(
+            chapters_to_download, max_concurrent_downloads,
+            lambda chapter, chapter_dir, success: done_queue.put((chapter, chapter_dir, success)),
+        ))
+    finally:
+        done_queue.put(None)  # Sentinel: no more chapters
+        finisher.join()
+
+def _images_in(directory, extensions):
+    """Return the sorted paths of files in directory whose extension (lowercase, no dot) is in extensions."""
+    with os.scandir(directory) as entries:
+        return sorted(
+            entry.path for entry in entries
+            if entry.is_file() and entry.name.rsplit('.', 1)[-1].lower() in extensions
+        )
+
+CBZ_WRITE_BUFFER = 1 << 20
 
 def create_cbz(chapter_dir, chapter_title):
     """Create a CBZ file from downloaded images."""
     try:
-        # Get all image files in the directory
-        image_files = []
-        for file in os.listdir(chapter_dir):
-            if file.lower().endswith(('.jpg', '.jpeg', '.png', '.webp', '.gif')):
-                image_files.append(os.path.join(chapter_dir, file))
+        # Get all image files in the directory, sorted by name (which should be numerical order)
+        image_files = _images_in(chapter_dir, _IMG_EXTS)
         
         if not image_files:
-            print(f"No images found in {chapter_dir} to create CBZ")
+            logger.warning("No images found in %s to create CBZ", chapter_dir)
             return None
         
-        # Sort files by name (which should be numerical order)
-        image_files.sort()
-        
         # Create CBZ file
         cbz_path = f"{chapter_dir}.cbz"
-        with zipfile.ZipFile(cbz_path, 'w') as zipf:
+        # Pages are already JPEG/PNG/WebP-compressed, so deflating them again only burns CPU;
+        # a 1 MiB write buffer turns zipfile's small header and chunk writes into a few large ones
+        with open(cbz_path, 'wb', buffering=CBZ_WRITE_BUFFER) as cbz_file, \
+                zipfile.ZipFile(cbz_file, 'w', compression=zipfile.ZIP_STORED) as zipf:
             for img_file in image_files:
                 # Add file to zip with just the filename, not the full path
                 zipf.write(img_file, os.path.basename(img_file))
         
-        print(f"Created CBZ file: {cbz_path}")
+        logger.info("Created CBZ file: %s", cbz_path)
         return cbz_path
     except Exception as e:
-        print(f"Error creating CBZ file: {e}")
+        logger.error("Error creating CBZ file: %s", e)
         return None
 
 def create_pdf(chapter_dir, chapter_title):
     """Create a PDF file from downloaded images."""
     try:
-        # Get all image files in the directory
-        image_files = []
-        for file in os.listdir(chapter_dir):
-            if file.lower().endswith(('.jpg', '.jpeg', '.png')):  # img2pdf doesn't support all formats
-                image_files.append(os.path.join(chapter_dir, file))
+        # Get all image files in the directory, sorted by name (which should be numerical order)
+        image_files = _images_in(chapter_dir, _PDF_EXTS)
         
         if not image_files:
-            print(f"No images found in {chapter_dir} to create PDF")
+            logger.warning("No images found in %s to create PDF", chapter_dir)
             return None
         
-        # Sort files by name (which should be numerical order)
-        image_files.sort()
-        
         # Create PDF file
         pdf_path = f"{chapter_dir}.pdf"
+        # Written straight to the file instead of building the whole PDF in memory first
         with open(pdf_path, "wb") as f:
-            pdf_bytes = img2pdf.convert(image_files)
-            if pdf_bytes:
-                f.write(pdf_bytes)
+            img2pdf.convert(image_files, outputstream=f)
         
-        print(f"Created PDF file: {pdf_path}")
+        logger.info("Created PDF file: %s", pdf_path)
         return pdf_path
     except Exception as e:
-        print(f"Error creating PDF file: {e}")
+        logger.error("Error creating PDF file: %s", e)
         return None
 
-def download_chapters_threaded(chapters_to_download, max_concurrent_downloads=5):
+def convert_chapter(chapter_dir, chapter_title, convert_option, delete_sources=False):
     """
-    Download multiple chapters using threading.
-    
-    Args:
-        chapters_to_download: List of chapter dictionaries to download
-        max_concurrent_downloads: Maximum number of concurrent downloads (applies to both chapters and images)
+    Convert a downloaded chapter to CBZ and/or PDF, optionally deleting the images afterwards.
+    The images are only deleted if every requested format was created.
+    Returns a list of (format label, output path or None), one per requested format.
     """
-    successful_downloads = []
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrent_downloads) as executor:
-        # Submit all chapter downloads to the executor
-        future_to_chapter = {
-            executor.submit(download_chapter_with_selenium, chapter['url'], chapter['title'], max_concurrent_downloads): chapter['title']
-            for chapter in chapters_to_download
-        }
-        
-        # Process results as they complete
-        for future in concurrent.futures.as_completed(future_to_chapter):
-            chapter_title = future_to_chapter[future]
-            try:
-                # Get the result (chapter directory and success status)
-                chapter_dir, success = future.result()
-                if success:
-                    successful_downloads.append((chapter_dir, chapter_title))
-                    print(f"Completed download of chapter: {chapter_title}")
-                else:
-                    print(f"Chapter download completed but may have issues: {chapter_title}")
-            except Exception as e:
-                print(f"Chapter download failed for {chapter_title}: {e}")
-    
-    return successful_downloads
+    results = []
+    if convert_option in ['cbz', 'both']:
+        results.append(('CBZ', create_cbz(chapter_dir, chapter_title)))
+    if convert_option in ['pdf', 'both']:
+        results.append(('PDF', create_pdf(chapter_dir, chapter_title)))
+
+    if delete_sources and results and all(output for _, output in results):
+        try:
+            shutil.rmtree(chapter_dir)
+            logger.info("Deleted original images for %s", chapter_title)
+        except Exception as e:
+            logger.error("Error deleting directory %s: %s", chapter_dir, e)
+    return results
+
+def configure_logging(level=logging.INFO):
+    """
+    Route this module's log records through a queue to a background listener thread,
+    so download workers never block on console writes. Returns the started listener.
+    """
+    log_queue = queue.SimpleQueue()
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, console)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+    listener.start()
+    return listener
+
+def flush_logs(listener):
+    """Block until every queued record has been written, so console output that follows appears after it."""
+    listener.stop()
+    listener.start()
 
 def main():
+    listener = configure_logging()
+    try:
+        run_cli(listener)
+    finally:
+        # Flush everything still queued before the process exits
+        listener.stop()
+
+def run_cli(listener):
+    # Prompts and menus go straight to the console while log records arrive through the listener
+    # thread, so pending records are written out first to keep the two in order
+    def say(message):
+        flush_logs(listener)
+        print(message)
+
+    def ask(prompt):
+        flush_logs(listener)
+        return input(prompt)
+
     # Ask user for manga URL
-    manga_url = input("Enter the URL of the manga on mangapark.net: ")
+    manga_url = ask("Enter the URL of the manga on mangapark.net: ")
 
     # Ask user for NSFW mode
-    nsfw_choice = input("Enable NSFW mode for adult content? (y/n): ").lower()
+    nsfw_choice = ask("Enable NSFW mode for adult content? (y/n): ").lower()
     use_nsfw_mode = nsfw_choice == 'y'
 
     # Get chapter information
     chapters = get_chapter_info(manga_url, use_nsfw_mode)
     
     if not chapters:
-        print("No chapters found or error occurred.")
+        say("No chapters found or error occurred.")
         return
         
     # Display available chapters
-    print(f"Found {len(chapters)} chapters:")
+    say(f"Found {len(chapters)} chapters:")
     for i, chapter in enumerate(chapters):
-        print(f"{i+1}. {chapter['title']}")
+        print(f"{i+1}. {chapter['title']}")  # Nothing is logging while the menu is shown
         
     # Ask user which chapters to download
-    selection = input("Enter chapter number to download (single) or a range (e.g., 5-10), or 'all' for all chapters: ")
+    selection = ask("Enter chapter number to download (single) or a range (e.g., 5-10), or 'all' for all chapters: ")
     
     # Create downloads directory if it doesn't exist
-    os.makedirs("downloads", exist_ok=True)
+    ensure_downloads_dir()
     
     # Process user selection
     chapters_to_download = []
@@ -563,10 +1153,10 @@ def main():
             if start > 0 and end <= len(chapters):
                 chapters_to_download = chapters[start-1:end]
             else:
-                print("Invalid chapter range.")
+                say("Invalid chapter range.")
                 return
         except ValueError:
-            print("Invalid range format.")
+            say("Invalid range format.")
             return
     else:
         # Single chapter
@@ -575,73 +1165,44 @@ def main():
             if 0 <= index < len(chapters):
                 chapters_to_download = [chapters[index]]
             else:
-                print("Chapter number out of range.")
+                say("Chapter number out of range.")
                 return
         except ValueError:
-            print("Invalid chapter number.")
+            say("Invalid chapter number.")
             return
             
     if not chapters_to_download:
-        print("No valid chapters selected.")
+        say("No valid chapters selected.")
         return
     
+    # Ask about conversion up front so each chapter is packaged as soon as it finishes downloading
+    convert_option = ask("Convert downloaded chapters to CBZ or PDF? (cbz/pdf/both/none): ").lower()
+    delete_sources = False
+    if convert_option in ['cbz', 'pdf', 'both']:
+        delete_sources = ask("Delete original images after conversion? (y/n): ").lower() == 'y'
+
+    def on_chapter_done(chapter, chapter_dir, success):
+        if success and convert_option in ['cbz', 'pdf', 'both']:
+            convert_chapter(chapter_dir, chapter['title'], convert_option, delete_sources)
+
     # Ask for threading options
-    use_threading = input("Use multi-threading for faster downloads? (y/n): ").lower() == 'y'
-    
-    successful_downloads = []
+    use_threading = ask("Use multi-threading for faster downloads? (y/n): ").lower() == 'y'
     
+    max_concurrent_downloads = 1  # One chapter and one connection at a time
     if use_threading:
         try:
-            max_concurrent_downloads = int(input("Enter maximum number of concurrent downloads (recommended: 3-8): "))
+            max_concurrent_downloads = int(ask("Enter maximum number of concurrent downloads (recommended: 3-8): "))
             if max_concurrent_downloads < 1:
                 max_concurrent_downloads = 5  # Default to 5 if invalid input
         except ValueError:
             max_concurrent_downloads = 5  # Default to 5 if invalid input
             
-        print(f"Initiating download for {len(chapters_to_download)} chapter(s) with {max_concurrent_downloads} concurrent downloads...")
-        successful_downloads = download_chapters_threaded(chapters_to_download, max_concurrent_downloads)
+        say(f"Initiating download for {len(chapters_to_download)} chapter(s) with {max_concurrent_downloads} concurrent downloads...")
     else:
-        print(f"Initiating download for {len(chapters_to_download)} chapter(s)...")
-        # Download selected chapters sequentially
-        for chapter in chapters_to_download:
-            chapter_dir, success = download_chapter_with_selenium(chapter['url'], chapter['title'], 1)  # Use 1 for sequential downloads
-            if success:
-                successful_downloads.append((chapter_dir, chapter['title']))
-            time.sleep(2)  # Add delay between chapter downloads
-    
-    # Ask user if they want to convert to CBZ/PDF
-    if successful_downloads:
-        convert_option = input("Convert downloaded chapters to CBZ or PDF? (cbz/pdf/both/none): ").lower()
-        
-        if convert_option in ['cbz', 'both']:
-            print("Converting chapters to CBZ format...")
-            for chapter_dir, chapter_title in successful_downloads:
-                cbz_path = create_cbz(chapter_dir, chapter_title)
-                if cbz_path:
-                    delete_option = input(f"CBZ created for {chapter_title}. Delete original images? (y/n): ").lower()
-                    if delete_option == 'y':
-                        try:
-                            shutil.rmtree(chapter_dir)
-                            print(f"Deleted original images for {chapter_title}")
-                        except Exception as e:
-                            print(f"Error deleting directory {chapter_dir}: {e}")
-        
-        if convert_option in ['pdf', 'both']:
-            print("Converting chapters to PDF format...")
-            for chapter_dir, chapter_title in successful_downloads:
-                # Check if directory still exists (might have been deleted after CBZ creation)
-                if os.path.exists(chapter_dir):
-                    pdf_path = create_pdf(chapter_dir, chapter_title)
-                    if pdf_path and convert_option != 'both':  # If 'both', we already asked about deletion
-                        delete_option = input(f"PDF created for {chapter_title}. Delete original images? (y/n): ").lower()
-                        if delete_option == 'y':
-                            try:
-                                shutil.rmtree(chapter_dir)
-                                print(f"Deleted original images for {chapter_title}")
-                            except Exception as e:
-                                print(f"Error deleting directory {chapter_dir}: {e}")
+        say(f"Initiating download for {len(chapters_to_download)} chapter(s)...")
+    download_chapters_threaded(chapters_to_download, max_concurrent_downloads, on_chapter_done)
     
-    print("Download complete.")
+    say("Download complete.")
 
 if __name__ == "__main__":
     main()